@@ -3,15 +3,22 @@ from __future__ import annotations
 
 import csv
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
     # 必要関数のみインポート
-    from sympa_ctl_utils import get_all_lists, get_list_emails, list_exists
+    from sympa_ctl_utils import DOMAIN, get_all_lists, get_list_emails, list_exists
 except Exception as e:
     print(f"\x1b[31mFailed to load sympa_list_tool: {e}\x1b[0m", file=sys.stderr)
     sys.exit(1)
 
+# 任意設定: 全ドメイン共通の同時実行数
+try:
+    from config import MAX_WORKERS
+except Exception:
+    MAX_WORKERS = 4
+
 RED = "\x1b[31m"
 RESET = "\x1b[0m"
 
@@ -20,52 +27,78 @@ def eprint_red(msg: str) -> None:
     print(f"{RED}{msg}{RESET}", file=sys.stderr)
 
 
-def dump_members_of_lists(listnames: list[str]) -> int:
+def label(listname: str, robot: str) -> str:
+    if robot == DOMAIN:
+        return listname
+    return f"{listname}@{robot}"
+
+
+def collect_members(robot: str, listnames: list[str]) -> tuple[list[tuple[str, str]], bool]:
     """
-    listnames に含まれる各MLの memberロールのメールアドレスをCSVで出力する。
-    出力形式: "ml名","ユーザ名"（ヘッダ無し）
+    robot 配下の各MLの memberロールを (ml名, ユーザ名) のリストで返す。
     あるMLで取得に失敗した場合は、そのMLをスキップし、他を続行する。
     """
-    writer = csv.writer(sys.stdout, lineterminator="\n")
-    exit_code = 0
-
+    rows: list[tuple[str, str]] = []
+    failed = False
     for ml in listnames:
-        ok, members, err = get_list_emails(ml, "member")
+        ok, members, err = get_list_emails(ml, "member", robot=robot)
         if not ok:
             # 最小限のエラー表示のみ
-            eprint_red(f"skip {ml}: {err}")
-            exit_code = 1  # どれか1つでも失敗があれば非0に
+            eprint_red(f"skip {label(ml, robot)}: {err}")
+            failed = True
             continue
         for addr in members:
-            writer.writerow([ml, addr])
+            rows.append((label(ml, robot), addr))
+    return rows, failed
+
+
+def dump_members_of_lists(targets: dict[str, list[str]]) -> int:
+    """
+    targets（robot → ML名のリスト）に含まれる各MLの memberロールのメールアドレスをCSVで出力する。
+    出力形式: "ml名","ユーザ名"（ヘッダ無し。DOMAIN 以外の robot は ml名@robot）
+    robot ごとに並列で取得し、出力は指定順に行う。
+    """
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    exit_code = 0
+
+    workers = max(1, min(MAX_WORKERS, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda item: collect_members(*item), targets.items())
+        for rows, failed in results:
+            if failed:
+                exit_code = 1  # どれか1つでも失敗があれば非0に
+            writer.writerows(rows)
 
     return exit_code
 
 
 def main() -> int:
-    # 引数: 0個または1個（'*' も可）
-    if len(sys.argv) > 2:
-        print(f"Usage: {Path(sys.argv[0]).name} [*|<listname>]", file=sys.stderr)
-        return 1
+    # 引数: 0個以上（各引数は '*' / <listname> で、@<robot> を付けるとドメインを指定）
+    args = sys.argv[1:] or ["*"]
 
     # 対象MLの決定
-    targets: list[str] = []
-    if len(sys.argv) == 1 or sys.argv[1] == "*":
-        ok, lists, err = get_all_lists()
-        if not ok:
-            eprint_red(f"failed to get all lists: {err}")
+    targets: dict[str, list[str]] = {}
+    for arg in args:
+        listname, _, robot = arg.strip().partition("@")
+        robot = robot or DOMAIN
+        if not listname:
+            print(f"Usage: {Path(sys.argv[0]).name} [*|<listname>][@<robot>] ...", file=sys.stderr)
             return 1
-        targets = lists
-    else:
-        listname = sys.argv[1].strip()
-        ok, exists, err = list_exists(listname)
-        if not ok:
-            eprint_red(f"failed to check list existence: {err}")
-            return 1
-        if not exists:
-            eprint_red(f"list not found: {listname}")
-            return 1
-        targets = [listname]
+        if listname == "*":
+            ok, lists, err = get_all_lists(robot=robot)
+            if not ok:
+                eprint_red(f"failed to get all lists: {err}")
+                return 1
+            targets.setdefault(robot, []).extend(lists)
+        else:
+            ok, exists, err = list_exists(listname, robot=robot)
+            if not ok:
+                eprint_red(f"failed to check list existence: {err}")
+                return 1
+            if not exists:
+                eprint_red(f"list not found: {label(listname, robot)}")
+                return 1
+            targets.setdefault(robot, []).append(listname)
 
     # 取得＆出力
     return dump_members_of_lists(targets)
@@ -73,4 +106,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     sys.exit(main())
-
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Set, Tuple
+
+# inotify は任意依存（未導入ならポーリングで監視する）
+try:
+    from inotify_simple import INotify, flags  # type: ignore
+except Exception:
+    INotify = None  # type: ignore[assignment]
+    flags = None  # type: ignore[assignment]
+
+
+# (robot, listname)
+ListKey = Tuple[str, str]
+
+
+class ListFileWatcher:
+    """
+    robot ごとの .list ディレクトリを監視し、書き込みが落ち着いた（debounce 秒変化の無い）
+    ML をまとめて返す。削除されたファイルは対象外。
+    """
+
+    def __init__(self, dirs: Dict[str, Path | str], debounce: float = 5.0, poll_interval: float = 2.0) -> None:
+        self.dirs = {robot: Path(d) for robot, d in dirs.items()}
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._pending: Dict[ListKey, float] = {}  # 最後に変化を検知した時刻
+
+    def catch_up(self) -> None:
+        """停止中の変更を取りこぼさないよう、既存の .list をすべて次のバッチの対象にする"""
+        for key in self._scan():
+            self._pending[key] = float("-inf")
+
+    def retry(self, keys: Set[ListKey], delay: float) -> None:
+        """反映に失敗した ML を delay 秒後のバッチで再度返す（その間に変更があれば通常どおり待ち合わせる）"""
+        at = time.monotonic() - self.debounce + delay
+        for key in keys:
+            self._pending[key] = max(self._pending.get(key, at), at)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if INotify is not None else "polling"
+
+    def batches(self) -> Iterator[Set[ListKey]]:
+        if INotify is not None:
+            changes = self._inotify_changes()
+        else:
+            changes = self._polling_changes()
+        for changed in changes:
+            now = time.monotonic()
+            for key in changed:
+                self._pending[key] = now
+            ready = {key for key, t in self._pending.items() if now - t >= self.debounce}
+            if ready:
+                for key in ready:
+                    del self._pending[key]
+                yield ready
+
+    # --- バックエンド: いずれも poll_interval ごとに変化した ML の集合を返す ---
+    def _inotify_changes(self) -> Iterator[Set[ListKey]]:
+        inotify = INotify()
+        wds: Dict[int, list[str]] = {}
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO
+        for robot, d in self.dirs.items():
+            # 存在しないディレクトリはポーリングと同様にスキップする
+            try:
+                wd = inotify.add_watch(str(d), mask)
+            except OSError as e:
+                print(f"\x1b[31mskip watching {d}: {e}\x1b[0m", file=sys.stderr)
+                continue
+            wds.setdefault(wd, []).append(robot)
+        while True:
+            changed: Set[ListKey] = set()
+            for event in inotify.read(timeout=int(self.poll_interval * 1000)):
+                if not event.name.endswith(".list"):
+                    continue
+                for robot in wds.get(event.wd, []):
+                    changed.add((robot, event.name[: -len(".list")]))
+            yield changed
+
+    def _polling_changes(self) -> Iterator[Set[ListKey]]:
+        snapshot = self._scan()
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._scan()
+            changed = {key for key, stat in current.items() if snapshot.get(key) != stat}
+            snapshot = current
+            yield changed
+
+    def _scan(self) -> Dict[ListKey, Tuple[int, int]]:
+        result: Dict[ListKey, Tuple[int, int]] = {}
+        for robot, d in self.dirs.items():
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(".list") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                result[(robot, entry.name[: -len(".list")])] = (st.st_mtime_ns, st.st_size)
+        return result
@@ -2,8 +2,14 @@
 from __future__ import annotations
 
 import csv
+import math
+import re
 import sys
 import shutil
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 try:
@@ -12,8 +18,41 @@ except Exception as e:
     print(f"\x1b[31mFailed to load config: {e}\x1b[0m", file=sys.stderr)
     sys.exit(1)
 
+# 任意設定: robot ごとの .list ディレクトリと、全ドメイン共通の同時実行数
+try:
+    from config import LISTFILE_DIRS
+except Exception:
+    LISTFILE_DIRS = {}
+try:
+    from config import MAX_WORKERS
+except Exception:
+    MAX_WORKERS = 4
+# 任意設定: REMOVE の方式（"purge": バックアップ後に即 purge / "close": 閉鎖して purge-closed で後から purge）
+try:
+    from config import REMOVE_MODE
+except Exception:
+    REMOVE_MODE = "purge"
+try:
+    from config import PURGE_GRACE_DAYS
+except Exception:
+    PURGE_GRACE_DAYS = 7
+# 任意設定: watch モードの待ち合わせ秒数とポーリング間隔
+try:
+    from config import WATCH_DEBOUNCE
+except Exception:
+    WATCH_DEBOUNCE = 5.0
+try:
+    from config import WATCH_POLL_INTERVAL
+except Exception:
+    WATCH_POLL_INTERVAL = 2.0
+try:
+    from config import WATCH_RETRY_INTERVAL
+except Exception:
+    WATCH_RETRY_INTERVAL = 60.0
+
 try:
     from sympa_ctl_utils import *
+    from list_watch import ListFileWatcher
 except Exception as e:
     print(f"\x1b[31mFailed to load sympa_list_tool: {e}\x1b[0m", file=sys.stderr)
     sys.exit(1)
@@ -22,11 +61,24 @@ except Exception as e:
 RED = "\x1b[31m"
 RESET = "\x1b[0m"
 
+LISTNAME_RE = re.compile(r"^[a-z0-9][a-z0-9.+_-]*$")
+
 
 def eprint_red(msg: str) -> None:
     print(f"{RED}{msg}{RESET}", file=sys.stderr)
 
 
+def label(listname: str, robot: str | None) -> str:
+    if not robot or robot == DOMAIN:
+        return listname
+    return f"{listname}@{robot}"
+
+
+def listfile_path(listname: str, robot: str | None = None) -> Path:
+    base = LISTFILE_DIRS.get(robot or DOMAIN, LISTFILE_DIR)
+    return Path(base) / f"{listname}.list"
+
+
 def rm_tree(path: Path | None) -> None:
     if not path:
         return
@@ -48,26 +100,45 @@ def write_temp_xml(xml_text: str) -> Path | None:
 
 
 
-def handle_create(listname: str, description: str) -> tuple[bool, str]:
+def is_closed_pending(listname: str, robot: str | None = None) -> tuple[bool, bool, Exception | None]:
+    """purge 待ちキューにあり、かつ閉鎖されたままか"""
+    ok, queue, err = get_purge_queue()
+    if not ok:
+        return False, False, err
+    if not any((r, n) == (robot or DOMAIN, listname) for r, n, _ in queue):
+        return True, False, None
+    return is_list_closed(listname, robot=robot)
+
+
+def handle_create(
+    listname: str, description: str, robot: str | None = None, ml: MLFile | None = None
+) -> tuple[bool, str]:
+    # 閉鎖済みで purge 待ちの同名MLは、export_list に出ていても作り直しの対象にする
+    ok, closed_pending, err = is_closed_pending(listname, robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "PURGE_QUEUE_FAILED"
+
     # 既存チェック
-    ok, exists, err = list_exists(listname)
+    ok, exists, err = list_exists(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
         return False, "LIST_EXISTS_FAILED"
-    if exists:
-        eprint_red(f"SKIP CREATE (already exists): {listname}")
+    if exists and not closed_pending:
+        eprint_red(f"SKIP CREATE (already exists): {label(listname, robot)}")
         return True, "SKIPPED"
 
-    # .list 読み込み
-    listfile = Path(LISTFILE_DIR) / f"{listname}.list"
-    if not listfile.exists():
-        eprint_red(f".list not found: {listfile}")
-        return False, "LISTFILE_NOT_FOUND"
+    # .list 読み込み（事前検証で読み込み済みならそれを使う）
+    if ml is None:
+        listfile = listfile_path(listname, robot)
+        if not listfile.exists():
+            eprint_red(f".list not found: {listfile}")
+            return False, "LISTFILE_NOT_FOUND"
 
-    ok, ml, err = load_ml_file(listfile)
-    if not ok:
-        eprint_red(str(err))
-        return False, "LOAD_LISTFILE_FAILED"
+        ok, ml, err = load_ml_file(listfile)
+        if not ok:
+            eprint_red(str(err))
+            return False, "LOAD_LISTFILE_FAILED"
 
     owners_csv = ",".join(ml.owners)
 
@@ -82,9 +153,18 @@ def handle_create(listname: str, description: str) -> tuple[bool, str]:
     if tmp_xml is None:
         return False, "XML_TMP_FAILED"
 
+    # 閉鎖済みで purge 待ちの同名MLがあれば、先に purge する
+    if closed_pending:
+        ok, _, err = purge_list(listname, robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            tmp_xml.unlink(missing_ok=True)
+            return False, "PURGE_CLOSED_FAILED"
+        _ = dequeue_purge(listname, robot=robot)
+
     # create_list → 直後に必ず XML を削除
     try:
-        ok, _, err = create_list(tmp_xml)
+        ok, _, err = create_list(tmp_xml, robot=robot)
     finally:
         tmp_xml.unlink(missing_ok=True)
 
@@ -98,17 +178,17 @@ def handle_create(listname: str, description: str) -> tuple[bool, str]:
         try:
             tmp_mem = mktemp_with_content(prefix="sympa_members_", suffix=".txt")
             tmp_mem.write_text("\n".join(ml.members) + "\n", encoding="utf-8")
-            ok, _, err = add_members(listname, tmp_mem)
+            ok, _, err = add_members(listname, tmp_mem, robot=robot)
             tmp_mem.unlink(missing_ok=True)
             if not ok:
                 eprint_red(str(err))
-                ok_purge, _, err_purge = purge_list(listname)
+                ok_purge, _, err_purge = purge_list(listname, robot=robot)
                 if not ok_purge:
                     eprint_red(f"purge after failure also failed: {err_purge}")
                 return False, "ADD_MEMBERS_FAILED"
         except Exception as e:
             eprint_red(f"Failed to materialize members file: {e}")
-            ok_purge, _, err_purge = purge_list(listname)
+            ok_purge, _, err_purge = purge_list(listname, robot=robot)
             if not ok_purge:
                 eprint_red(f"purge after failure also failed: {err_purge}")
             return False, "ADD_MEMBERS_IO_FAILED"
@@ -118,63 +198,70 @@ def handle_create(listname: str, description: str) -> tuple[bool, str]:
         try:
             tmp_edit = mktemp_with_content(prefix="sympa_editors_", suffix=".txt")
             tmp_edit.write_text("\n".join(ml.editors) + "\n", encoding="utf-8")
-            ok, _, err = add_editor(listname, tmp_edit)
+            ok, _, err = add_editor(listname, tmp_edit, robot=robot)
             tmp_edit.unlink(missing_ok=True)
             if not ok:
                 eprint_red(str(err))
-                ok_purge, _, err_purge = purge_list(listname)
+                ok_purge, _, err_purge = purge_list(listname, robot=robot)
                 if not ok_purge:
                     eprint_red(f"purge after failure also failed: {err_purge}")
                 return False, "ADD_EDITORS_FAILED"
         except Exception as e:
             eprint_red(f"Failed to materialize editors file: {e}")
-            ok_purge, _, err_purge = purge_list(listname)
+            ok_purge, _, err_purge = purge_list(listname, robot=robot)
             if not ok_purge:
                 eprint_red(f"purge after failure also failed: {err_purge}")
             return False, "ADD_EDITORS_IO_FAILED"
 
-    print(f"OK CREATE {listname}")
+    print(f"OK CREATE {label(listname, robot)}")
     return True, "OK"
 
 
-def handle_replace(listname: str, description: str) -> tuple[bool, str]:
+def handle_replace(
+    listname: str,
+    description: str,
+    robot: str | None = None,
+    update_description: bool = False,
+    ml: MLFile | None = None,
+) -> tuple[bool, str]:
     # 存在確認
-    ok, exists, err = list_exists(listname)
+    ok, exists, err = list_exists(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
         return False, "LIST_EXISTS_FAILED"
 
     if not exists:
-        eprint_red(f"SKIP REPLACE (list not found): {listname}")
+        eprint_red(f"SKIP REPLACE (list not found): {label(listname, robot)}")
         return True, "SKIPPED"
 
     # バックアップ（失敗したらスキップ）
-    ok, backup_dir, err = backup_ml(listname)
+    ok, backup_dir, err = backup_ml(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
         return False, "BACKUP_FAILED"
 
-    # .list 読み込み
-    listfile = Path(LISTFILE_DIR) / f"{listname}.list"
-    if not listfile.exists():
-        eprint_red(f".list not found: {listfile}")
-        rm_tree(backup_dir)
-        return False, "LISTFILE_NOT_FOUND"
+    # .list 読み込み（事前検証で読み込み済みならそれを使う）
+    if ml is None:
+        listfile = listfile_path(listname, robot)
+        if not listfile.exists():
+            eprint_red(f".list not found: {listfile}")
+            rm_tree(backup_dir)
+            return False, "LISTFILE_NOT_FOUND"
 
-    ok, ml, err = load_ml_file(listfile)
-    if not ok:
-        eprint_red(str(err))
-        rm_tree(backup_dir)
-        return False, "LOAD_LISTFILE_FAILED"
+        ok, ml, err = load_ml_file(listfile)
+        if not ok:
+            eprint_red(str(err))
+            rm_tree(backup_dir)
+            return False, "LOAD_LISTFILE_FAILED"
 
     # 既存ロール削除（失敗しても続行、ログのみ）
-    ok, _, err = del_members(listname)
+    ok, _, err = del_members(listname, robot=robot)
     if not ok and err:
         eprint_red(f"del_members: {err}")
-    ok, _, err = del_editors(listname)
+    ok, _, err = del_editors(listname, robot=robot)
     if not ok and err:
         eprint_red(f"del_editors: {err}")
-    ok, _, err = del_owners(listname)
+    ok, _, err = del_owners(listname, robot=robot)
     if not ok and err:
         eprint_red(f"del_owners: {err}")
 
@@ -183,16 +270,16 @@ def handle_replace(listname: str, description: str) -> tuple[bool, str]:
         try:
             tmp = mktemp_with_content(prefix="sympa_owners_", suffix=".txt")
             tmp.write_text("\n".join(ml.owners) + "\n", encoding="utf-8")
-            ok, _, err = add_owners(listname, tmp)
+            ok, _, err = add_owners(listname, tmp, robot=robot)
             tmp.unlink(missing_ok=True)
             if not ok:
                 eprint_red(str(err))
-                _ = restore_ml(listname, backup_dir)
+                _ = restore_ml(listname, backup_dir, robot=robot)
                 rm_tree(backup_dir)
                 return False, "ADD_OWNERS_FAILED"
         except Exception as e:
             eprint_red(f"Failed to materialize owners file: {e}")
-            _ = restore_ml(listname, backup_dir)
+            _ = restore_ml(listname, backup_dir, robot=robot)
             rm_tree(backup_dir)
             return False, "ADD_OWNERS_IO_FAILED"
 
@@ -201,16 +288,16 @@ def handle_replace(listname: str, description: str) -> tuple[bool, str]:
         try:
             tmp = mktemp_with_content(prefix="sympa_members_", suffix=".txt")
             tmp.write_text("\n".join(ml.members) + "\n", encoding="utf-8")
-            ok, _, err = add_members(listname, tmp)
+            ok, _, err = add_members(listname, tmp, robot=robot)
             tmp.unlink(missing_ok=True)
             if not ok:
                 eprint_red(str(err))
-                _ = restore_ml(listname, backup_dir)
+                _ = restore_ml(listname, backup_dir, robot=robot)
                 rm_tree(backup_dir)
                 return False, "ADD_MEMBERS_FAILED"
         except Exception as e:
             eprint_red(f"Failed to materialize members file: {e}")
-            _ = restore_ml(listname, backup_dir)
+            _ = restore_ml(listname, backup_dir, robot=robot)
             rm_tree(backup_dir)
             return False, "ADD_MEMBERS_IO_FAILED"
 
@@ -219,56 +306,370 @@ def handle_replace(listname: str, description: str) -> tuple[bool, str]:
         try:
             tmp = mktemp_with_content(prefix="sympa_editors_", suffix=".txt")
             tmp.write_text("\n".join(ml.editors) + "\n", encoding="utf-8")
-            ok, _, err = add_editor(listname, tmp)
+            ok, _, err = add_editor(listname, tmp, robot=robot)
             tmp.unlink(missing_ok=True)
             if not ok:
                 eprint_red(str(err))
-                _ = restore_ml(listname, backup_dir)
+                _ = restore_ml(listname, backup_dir, robot=robot)
                 rm_tree(backup_dir)
                 return False, "ADD_EDITORS_FAILED"
         except Exception as e:
             eprint_red(f"Failed to materialize editors file: {e}")
-            _ = restore_ml(listname, backup_dir)
+            _ = restore_ml(listname, backup_dir, robot=robot)
             rm_tree(backup_dir)
             return False, "ADD_EDITORS_IO_FAILED"
 
+    # description 更新（REMOVE+CREATE をまとめた場合。ロールは反映済みのため戻さず、失敗として返す）
+    if update_description:
+        ok, _, err = set_list_description(listname, description, robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            rm_tree(backup_dir)
+            return False, "SET_DESCRIPTION_FAILED"
+
     rm_tree(backup_dir)
-    print(f"OK REPLACE {listname}")
+    print(f"OK REPLACE {label(listname, robot)}")
     return True, "OK"
 
 
-def handle_remove(listname: str) -> tuple[bool, str]:
+def handle_remove(listname: str, robot: str | None = None) -> tuple[bool, str]:
 
-    ok, exists, err = list_exists(listname)
+    ok, exists, err = list_exists(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
         return False, "LIST_EXISTS_FAILED"
 
     if not exists:
-        eprint_red(f"SKIP REMOVE (list not found): {listname}")
+        eprint_red(f"SKIP REMOVE (list not found): {label(listname, robot)}")
         return True, "SKIPPED"
 
+    # close モード: 閉鎖は元に戻せるためバックアップは取らず、purge はキューに回す
+    #  閉鎖前にキューへ登録する（閉鎖に失敗しても purge-closed は閉鎖されていないMLを外すだけ）
+    if REMOVE_MODE == "close":
+        ok, _, err = enqueue_purge(listname, robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            return False, "ENQUEUE_PURGE_FAILED"
+        ok, _, err = close_list(listname, robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            return False, "CLOSE_FAILED"
+        print(f"OK REMOVE {label(listname, robot)} (closed, purge queued)")
+        return True, "OK"
+
     # バックアップ（失敗したらスキップ）
-    ok, backup_dir, err = backup_ml(listname)
+    ok, backup_dir, err = backup_ml(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
         return False, "BACKUP_FAILED"
 
-    ok, _, err = purge_list(listname)
+    ok, _, err = purge_list(listname, robot=robot)
     if not ok:
         eprint_red(str(err))
-        _ = restore_ml(listname, backup_dir)
+        _ = restore_ml(listname, backup_dir, robot=robot)
         rm_tree(backup_dir)
         return False, "PURGE_FAILED"
 
     rm_tree(backup_dir)
-    print(f"OK REMOVE {listname}")
+    print(f"OK REMOVE {label(listname, robot)}")
+    return True, "OK"
+
+
+def handle_purge_closed(listname: str, robot: str | None = None) -> tuple[bool, str]:
+    # 閉鎖後に再開されたMLは purge せずキューから外す
+    ok, closed, err = is_list_closed(listname, robot=robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "IS_CLOSED_FAILED"
+    if not closed:
+        eprint_red(f"SKIP PURGE (not closed): {label(listname, robot)}")
+        _ = dequeue_purge(listname, robot=robot)
+        return True, "SKIPPED"
+
+    ok, _, err = purge_list(listname, robot=robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "PURGE_FAILED"
+    _ = dequeue_purge(listname, robot=robot)
+    print(f"OK PURGE {label(listname, robot)}")
+    return True, "OK"
+
+
+def handle_sync(listname: str, robot: str | None = None) -> tuple[bool, str]:
+    """.list と現在のロールの差分だけを add/del する（watch モード用）"""
+    ok, exists, err = list_exists(listname, robot=robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "LIST_EXISTS_FAILED"
+    if not exists:
+        eprint_red(f"SKIP SYNC (list not found): {label(listname, robot)}")
+        return True, "SKIPPED"
+
+    listfile = listfile_path(listname, robot)
+    ok, ml, err = load_ml_file(listfile)
+    if not ok:
+        eprint_red(str(err))
+        return False, "LOAD_LISTFILE_FAILED"
+    validated, issues = validate_ml_file(ml)
+    for role, addr, reason in issues:
+        tag = "QUARANTINE" if reason in ("invalid", "duplicate") else "NOTICE"
+        eprint_red(f"{tag} {label(listname, robot)} {role} {addr}: {reason}")
+    emptied = emptied_roles(ml, validated)
+    if emptied:
+        eprint_red(f"SKIP SYNC (all {','.join(emptied)} addresses quarantined): {label(listname, robot)}")
+        return False, "VALIDATION_FAILED"
+    ml = validated
+
+    ok, current, err = get_list_role_ids(listname, robot=robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "DUMP_FAILED"
+
+    # owner は追加を先に行い、オーナー不在の状態を作らない
+    wanted = {"owner": ml.owner_ids, "member": ml.member_ids, "editor": ml.editor_ids}
+    n_add = n_del = 0
+    for role in (Role.OWNER, Role.MEMBER, Role.EDITOR):
+        to_add, to_del = diff_ids(wanted[role.value], current[role.value])
+        # オーナーが空になる削除は行わない
+        if role is Role.OWNER and not wanted["owner"]:
+            to_del = array("I")
+        ok, _, err = add_emails(listname, role, ADDRESSES.to_addresses(to_add), robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            return False, f"ADD_{role.name}S_FAILED"
+        ok, _, err = del_emails(listname, role, ADDRESSES.to_addresses(to_del), robot=robot)
+        if not ok:
+            eprint_red(str(err))
+            return False, f"DEL_{role.name}S_FAILED"
+        n_add += len(to_add)
+        n_del += len(to_del)
+
+    print(f"OK SYNC {label(listname, robot)} (+{n_add} -{n_del})")
     return True, "OK"
 
 
+# === 実行計画 ===
+# 同一MLに対する複数行を、ML が既に存在する場合/存在しない場合それぞれの
+# 最終的な1アクション（SKIP / CREATE / REPLACE / REPLACE_DESC / REMOVE）に畳み込む。
+# .list は実行時に1度だけ読まれるため、REPLACE の繰り返しは1回と等価。
+@dataclass
+class PlannedOp:
+    robot: str
+    listname: str
+    rows: list[tuple[str, str]]  # 元の (CMD, DESCRIPTION)
+    on_exists: tuple[str, str] = ("SKIP", "")
+    on_absent: tuple[str, str] = ("SKIP", "")
+    ml: MLFile | None = None  # 事前検証済みの .list
+    error: str | None = None  # 事前検証で不合格になった理由（.list を使う操作は実行しない）
+
+
+def fold_rows(rows: list[tuple[str, str]], exists: bool) -> tuple[str, str]:
+    present = exists
+    action, desc = "SKIP", ""
+    for cmd, description in rows:
+        if cmd == "CREATE":
+            if present:
+                continue
+            present = True
+            # 既存MLを REMOVE してから CREATE する場合は description 付きの REPLACE になる
+            action, desc = ("REPLACE_DESC", description) if exists else ("CREATE", description)
+        elif cmd == "REPLACE":
+            if present and action == "SKIP":
+                action, desc = "REPLACE", description
+        elif cmd == "REMOVE":
+            if not present:
+                continue
+            present = False
+            action, desc = ("REMOVE", "") if exists else ("SKIP", "")
+    return action, desc
+
+
+def build_plan(rows_clean: list[tuple[str, str, str, str]]) -> list[PlannedOp]:
+    plan: dict[tuple[str, str], PlannedOp] = {}
+    for cmd, listname, description, robot in rows_clean:
+        key = (robot, listname)
+        if key not in plan:
+            plan[key] = PlannedOp(robot=robot, listname=listname, rows=[])
+        plan[key].rows.append((cmd, description))
+    for op in plan.values():
+        op.on_exists = fold_rows(op.rows, True)
+        op.on_absent = fold_rows(op.rows, False)
+    return list(plan.values())
+
+
+def report_plan(plan: list[PlannedOp], n_rows: int) -> None:
+    print(f"PLAN {n_rows} rows -> {len(plan)} lists")
+    for op in plan:
+        if len(op.rows) < 2:
+            continue
+        cmds = "+".join(cmd for cmd, _ in op.rows)
+        print(
+            f"PLAN {label(op.listname, op.robot)}: {cmds}"
+            f" -> exists: {op.on_exists[0]}, absent: {op.on_absent[0]}"
+        )
+
+
+def validate_plan(plan: list[PlannedOp], report_path: Path) -> None:
+    """
+    .list を使う操作について、全ロールのアドレスを事前に検証する。
+    書式不正・重複は除外して op.ml に検証済みの内容を持たせ、検出内容は report_path に CSV で出力する。
+    .list が無い/読めない場合はここでは何もせず、実行時のエラーに任せる。
+    """
+    rows: list[list[str]] = []
+    n_rejected = 0
+    for op in plan:
+        actions = {op.on_exists[0], op.on_absent[0]}
+        if not actions & {"CREATE", "REPLACE", "REPLACE_DESC"}:
+            continue
+        listfile = listfile_path(op.listname, op.robot)
+        if not listfile.exists():
+            continue
+        ok, ml, _ = load_ml_file(listfile)
+        if not ok:
+            continue
+        op.ml, issues = validate_ml_file(ml)
+        for role, addr, reason in issues:
+            rows.append([label(op.listname, op.robot), role, addr, reason])
+            if reason in ("invalid", "duplicate"):
+                n_rejected += 1
+        # 除外によりロールが空になる場合は、オーナー不在などを避けるため実行しない
+        emptied = emptied_roles(ml, op.ml)
+        if emptied:
+            op.error = f"all {','.join(emptied)} addresses quarantined"
+
+    # 指摘が無ければ前回のレポートを残さない
+    if not rows:
+        try:
+            report_path.unlink(missing_ok=True)
+        except Exception as e:
+            eprint_red(f"Failed to remove stale quarantine report: {e}")
+        return
+    try:
+        with report_path.open("w", encoding="utf-8", newline="") as f:
+            csv.writer(f, lineterminator="\n").writerows(rows)
+    except Exception as e:
+        eprint_red(f"Failed to write quarantine report: {e}")
+        for row in rows:
+            eprint_red("QUARANTINE " + " ".join(row))
+        return
+    eprint_red(f"QUARANTINE {n_rejected} addresses rejected ({len(rows)} findings): {report_path}")
+
+
+def run_planned(op: PlannedOp) -> tuple[bool, str]:
+    listname, robot = op.listname, op.robot
+    ok, exists, err = list_exists(listname, robot=robot)
+    if not ok:
+        eprint_red(str(err))
+        return False, "LIST_EXISTS_FAILED"
+    # 閉鎖済みで purge 待ちのMLは存在しないものとして扱う（CREATE で作り直す）
+    if exists:
+        ok, closed_pending, err = is_closed_pending(listname, robot)
+        if not ok:
+            eprint_red(str(err))
+            return False, "PURGE_QUEUE_FAILED"
+        exists = not closed_pending
+
+    action, description = op.on_exists if exists else op.on_absent
+    if op.error and action in ("CREATE", "REPLACE", "REPLACE_DESC"):
+        eprint_red(f"SKIP {action} ({op.error}): {label(listname, robot)}")
+        return False, "VALIDATION_FAILED"
+    if action == "CREATE":
+        return handle_create(listname, description, robot, ml=op.ml)
+    if action == "REPLACE":
+        return handle_replace(listname, description, robot, ml=op.ml)
+    if action == "REPLACE_DESC":
+        return handle_replace(listname, description, robot, update_description=True, ml=op.ml)
+    if action == "REMOVE":
+        return handle_remove(listname, robot)
+
+    if len(op.rows) == 1:
+        reason = "already exists" if exists else "list not found"
+        eprint_red(f"SKIP {op.rows[0][0]} ({reason}): {label(listname, robot)}")
+    else:
+        cmds = "+".join(cmd for cmd, _ in op.rows)
+        eprint_red(f"SKIP {cmds} (no-op): {label(listname, robot)}")
+    return True, "SKIPPED"
+
+
+def run_per_robot(jobs: dict[str, list], runner) -> dict[str, object]:
+    """
+    robot ごとのジョブを robot 内は順に、robot 間は MAX_WORKERS を上限に並列で実行する。
+    返り値は robot ごとの runner の戻り値。
+    """
+    workers = max(1, min(MAX_WORKERS, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {robot: pool.submit(runner, robot, items) for robot, items in jobs.items()}
+    return {robot: f.result() for robot, f in futures.items()}
+
+
+def watch() -> int:
+    dirs = {DOMAIN: Path(LISTFILE_DIR)}
+    dirs.update({robot: Path(d) for robot, d in LISTFILE_DIRS.items()})
+    watcher = ListFileWatcher(dirs, debounce=WATCH_DEBOUNCE, poll_interval=WATCH_POLL_INTERVAL)
+    print(f"WATCH {', '.join(str(d) for d in dirs.values())} ({watcher.backend})")
+    # 起動時に既存の .list をすべて1度反映する（停止中の変更の取りこぼし防止）
+    watcher.catch_up()
+
+    try:
+        for changed in watcher.batches():
+            jobs: dict[str, list[str]] = {}
+            for robot, listname in sorted(changed):
+                if LISTNAME_RE.match(listname):
+                    jobs.setdefault(robot, []).append(listname)
+            # 長時間動作するため、ML 一覧はバッチごとに取り直す
+            for robot in jobs:
+                ok, _, err = get_all_lists(robot=robot)
+                if not ok:
+                    eprint_red(str(err))
+            # 失敗・未作成の ML は WATCH_RETRY_INTERVAL 秒後に再試行する
+            failed = {
+                (robot, listname)
+                for robot, listnames in run_per_robot(jobs, run_syncs).items()
+                for listname in listnames
+            }
+            if failed:
+                eprint_red(f"RETRY {len(failed)} lists in {WATCH_RETRY_INTERVAL:g}s")
+                watcher.retry(failed, WATCH_RETRY_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def purge_closed(grace_days: float) -> int:
+    ok, queue, err = get_purge_queue()
+    if not ok:
+        eprint_red(str(err))
+        return 1
+
+    deadline = time.time() - grace_days * 86400
+    jobs: dict[str, list[str]] = {}
+    for robot, listname, closed_at in queue:
+        if closed_at <= deadline:
+            jobs.setdefault(robot, []).append(listname)
+    n_due = sum(len(v) for v in jobs.values())
+    print(f"PURGE-CLOSED {n_due} of {len(queue)} queued lists (grace {grace_days:g} days)")
+    run_per_robot(jobs, run_purges)
+    return 0
+
+
 def main() -> int:
+    if len(sys.argv) == 2 and sys.argv[1] == "watch":
+        return watch()
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "purge-closed":
+        raw = sys.argv[2] if len(sys.argv) == 3 else PURGE_GRACE_DAYS
+        try:
+            grace_days = float(raw)
+        except ValueError:
+            grace_days = float("nan")
+        if not math.isfinite(grace_days) or grace_days < 0:
+            eprint_red(f"invalid grace days: {raw}")
+            return 1
+        return purge_closed(grace_days)
     if len(sys.argv) != 2:
-        print(f"Usage: {Path(sys.argv[0]).name} <csv_file>", file=sys.stderr)
+        print(
+            f"Usage: {Path(sys.argv[0]).name} <csv_file> | watch | purge-closed [grace_days]",
+            file=sys.stderr,
+        )
         return 1
     csv_path = Path(sys.argv[1])
 
@@ -285,11 +686,11 @@ def main() -> int:
     # --- 事前検証フェーズ（不合格なら即終了） ---
     with f:
         reader = csv.reader(f)
-        rows_clean: list[tuple[str, str, str]] = []
+        rows_clean: list[tuple[str, str, str, str]] = []
         allowed_cmds = {"CREATE", "REPLACE", "REMOVE"}
 
-        import re as _re
-        name_re = _re.compile(r"^[a-z0-9][a-z0-9.+_-]*$")
+        name_re = LISTNAME_RE
+        robot_re = re.compile(r"^[A-Za-z0-9][A-Za-z0-9.-]*$")
 
         for idx, row in enumerate(reader, start=1):
             # 空行はスキップ（検証対象外）
@@ -298,12 +699,14 @@ def main() -> int:
 
             # カラム数チェック
             if len(row) < 3:
-                eprint_red(f"{idx}: invalid columns (need CMD,LISTNAME,DESCRIPTION)")
+                eprint_red(f"{idx}: invalid columns (need CMD,LISTNAME,DESCRIPTION[,ROBOT])")
                 return 1
 
             cmd = (row[0] or "").strip().upper()
             listname = (row[1] or "").strip()
             description = (row[2] or "").strip()
+            robot = (row[3] or "").strip() if len(row) > 3 else ""
+            robot = robot or DOMAIN
 
             # CMD チェック
             if cmd not in allowed_cmds:
@@ -315,30 +718,68 @@ def main() -> int:
                 eprint_red(f"{idx}: invalid LISTNAME '{listname}'")
                 return 1
 
-            rows_clean.append((cmd, listname, description))
+            # ROBOT チェック
+            if not robot_re.match(robot):
+                eprint_red(f"{idx}: invalid ROBOT '{robot}'")
+                return 1
+
+            rows_clean.append((cmd, listname, description, robot))
         if rows_clean == []:
             eprint_red("No valid rows found in CSV")
             return 1    
 
-    for cmd, listname, description in rows_clean:
+    # --- 計画フェーズ: 同一MLの複数行を畳み込み、実行前に報告 ---
+    plan = build_plan(rows_clean)
+    report_plan(plan, len(rows_clean))
+
+    # --- アドレス検証フェーズ: 不正なアドレスは除外して報告し、残りで実行する ---
+    validate_plan(plan, csv_path.with_name(csv_path.stem + ".quarantine.csv"))
+
+    # robot ごとに CSV の順序を保って直列実行し、robot 間は並列に実行する
+    by_robot: dict[str, list[PlannedOp]] = {}
+    for op in plan:
+        by_robot.setdefault(op.robot, []).append(op)
+    run_per_robot(by_robot, run_ops)
+
+    return 0
+
+
+def run_ops(robot: str, ops: list[PlannedOp]) -> None:
+    for op in ops:
         try:
-            if cmd == "CREATE":
-                ok, _ = handle_create(listname, description)
-                if not ok:
-                    continue
-            elif cmd == "REPLACE":
-                ok, _ = handle_replace(listname, description)
-                if not ok:
-                    continue
-            elif cmd == "REMOVE":
-                ok, _ = handle_remove(listname)
-                if not ok:
-                    continue
+            ok, _ = run_planned(op)
+            if not ok:
+                continue
         except Exception as e:
-            eprint_red(f"{listname}: unexpected error: {e}")
+            eprint_red(f"{label(op.listname, robot)}: unexpected error: {e}")
             continue
 
-    return 0
+
+def run_purges(robot: str, listnames: list[str]) -> None:
+    for listname in listnames:
+        try:
+            ok, _ = handle_purge_closed(listname, robot)
+            if not ok:
+                continue
+        except Exception as e:
+            eprint_red(f"{label(listname, robot)}: unexpected error: {e}")
+            continue
+
+
+def run_syncs(robot: str, listnames: list[str]) -> list[str]:
+    """反映できなかった（失敗した・ML が未作成の）ML名を返す"""
+    failed: list[str] = []
+    for listname in listnames:
+        try:
+            ok, status = handle_sync(listname, robot)
+            if not ok or status == "SKIPPED":
+                failed.append(listname)
+                continue
+        except Exception as e:
+            eprint_red(f"{label(listname, robot)}: unexpected error: {e}")
+            failed.append(listname)
+            continue
+    return failed
 
 
 if __name__ == "__main__":
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import re
 import os
+import fcntl
 import subprocess
 import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Iterable, Iterator
 
 # === 設定 ===
 #  同ディレクトリ or パッケージ配下の config.py から読み込む
@@ -21,6 +26,42 @@ assert isinstance(LISTDATA_DIR, (str, Path))
 assert isinstance(DOMAIN, str)
 LISTDATA_DIR = Path(LISTDATA_DIR)
 
+# 任意設定: ドメイン(robot)ごとの list_data ディレクトリ
+#  未指定の robot は LISTDATA_DIR と同じ階層の <robot> ディレクトリを使う
+try:
+    from .config import LISTDATA_DIRS  # type: ignore
+except Exception:
+    try:
+        from config import LISTDATA_DIRS  # type: ignore
+    except Exception:
+        LISTDATA_DIRS = {}
+
+assert isinstance(LISTDATA_DIRS, dict)
+LISTDATA_DIRS = {robot: Path(d) for robot, d in LISTDATA_DIRS.items()}
+
+# 任意設定: 閉鎖済みで purge 待ちの ML を記録するファイル
+try:
+    from .config import PURGE_QUEUE_FILE  # type: ignore
+except Exception:
+    try:
+        from config import PURGE_QUEUE_FILE  # type: ignore
+    except Exception:
+        PURGE_QUEUE_FILE = Path(__file__).resolve().parent / "purge_queue.tsv"
+
+PURGE_QUEUE_FILE = Path(PURGE_QUEUE_FILE)
+
+
+def _robot(robot: str | None) -> str:
+    return robot or DOMAIN
+
+def listdata_dir(robot: str | None = None) -> Path:
+    robot = _robot(robot)
+    if robot in LISTDATA_DIRS:
+        return LISTDATA_DIRS[robot]
+    if robot == DOMAIN:
+        return LISTDATA_DIR
+    return LISTDATA_DIR.parent / robot
+
 
 # === 例外型 ===
 class SympaError(RuntimeError):
@@ -49,6 +90,61 @@ class Role(str, Enum):
     MEMBER = "member"
 
 
+# === アドレス表 ===
+# 実行全体で共有する。各アドレスは正規化して1度だけ保持し、以降は整数IDで参照する。
+# ロールのメンバーシップは array('I') (ID 1つにつき4バイト) で持つ。
+# Sympa はアドレス全体を小文字で保持するため、ローカル部も含めて小文字にそろえる
+def canonical_address(addr: str) -> str:
+    return addr.strip().lower()
+
+_EMAIL_RE = re.compile(
+    r"^[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+"
+    r"@[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?(?:\.[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?)+$"
+)
+
+class AddressTable:
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._addrs: List[str] = []
+        self._valid = bytearray()  # 書式判定のキャッシュ 0: 未判定 1: 正常 2: 不正
+        self._lock = threading.Lock()
+
+    def intern(self, addr: str) -> int:
+        key = canonical_address(addr)
+        aid = self._ids.get(key)
+        if aid is not None:
+            return aid
+        with self._lock:
+            aid = self._ids.get(key)
+            if aid is None:
+                aid = len(self._addrs)
+                self._addrs.append(key)
+                self._valid.append(0)
+                self._ids[key] = aid
+        return aid
+
+    def is_valid(self, aid: int) -> bool:
+        v = self._valid[aid]
+        if v == 0:
+            v = 1 if _EMAIL_RE.match(self._addrs[aid]) else 2
+            self._valid[aid] = v
+        return v == 1
+
+    def address(self, aid: int) -> str:
+        return self._addrs[aid]
+
+    def to_addresses(self, ids: Iterable[int]) -> List[str]:
+        return [self._addrs[i] for i in ids]
+
+ADDRESSES = AddressTable()
+
+def diff_ids(want: Iterable[int], have: Iterable[int]) -> Tuple[array, array]:
+    """(want にのみ存在するID, have にのみ存在するID) を返す"""
+    w = set(want)
+    h = set(have)
+    return array("I", sorted(w - h)), array("I", sorted(h - w))
+
+
 # === ヘルパー ===
 def _ok(result: Any = None) -> Tuple[bool, Any, None]:
     return True, result, None
@@ -59,49 +155,75 @@ def _ng(message: str, *, cmd_desc: str | None = None) -> Tuple[bool, None, Excep
 
 
 # === 存在確認・一覧 ===
-def list_exists(listname: str) -> Tuple[bool, bool, Exception | None]:
-    rc, out, err = run_sympa(["export_list", DOMAIN])
-    if rc != 0:
-        return _ng(
-            f"export_list 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
-            cmd_desc="export_list",
-        )
-    exists = any(line.strip() == listname for line in out.splitlines())
-    return _ok(exists)
+# export_list の結果は robot ごとにキャッシュし、create/purge/close で更新する
+_LIST_INDEX: Dict[str, set] = {}
+_LIST_INDEX_LOCK = threading.Lock()
+
+def _invalidate_list_index(robot: str | None) -> None:
+    with _LIST_INDEX_LOCK:
+        _LIST_INDEX.pop(_robot(robot), None)
 
-def get_all_lists() -> Tuple[bool, List[str], Exception | None]:
-    rc, out, err = run_sympa(["export_list", DOMAIN])
+def get_all_lists(*, robot: str | None = None) -> Tuple[bool, List[str], Exception | None]:
+    rc, out, err = run_sympa(["export_list", _robot(robot)])
     if rc != 0:
         return _ng(
             f"export_list 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
             cmd_desc="export_list",
         )
     lists = [line.strip() for line in out.splitlines() if line.strip()]
+    with _LIST_INDEX_LOCK:
+        _LIST_INDEX[_robot(robot)] = set(lists)
     return _ok(lists)
 
+def list_exists(listname: str, *, robot: str | None = None) -> Tuple[bool, bool, Exception | None]:
+    with _LIST_INDEX_LOCK:
+        index = _LIST_INDEX.get(_robot(robot))
+    if index is None:
+        ok, lists, err = get_all_lists(robot=robot)
+        if not ok:
+            return False, None, err  # type: ignore[return-value]
+        index = set(lists)
+    return _ok(listname in index)
+
 
 # === メーリングリスト操作 ===
-def purge_list(listname: str) -> Tuple[bool, None, Exception | None]:
-    rc, out, err = run_sympa(["--purge_list", f"{listname}@{DOMAIN}"])
+def purge_list(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    rc, out, err = run_sympa(["--purge_list", f"{listname}@{_robot(robot)}"])
     if rc != 0:
         return _ng(
             f"purge_list 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
             cmd_desc="purge_list",
         )
+    with _LIST_INDEX_LOCK:
+        _LIST_INDEX.get(_robot(robot), set()).discard(listname)
     return _ok()
 
-def close_list(listname: str) -> Tuple[bool, None, Exception | None]:
-    rc, out, err = run_sympa(["--close_list", f"{listname}@{DOMAIN}"])
+def close_list(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    rc, out, err = run_sympa(["--close_list", f"{listname}@{_robot(robot)}"])
     if rc != 0:
         return _ng(
             f"close_list 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
             cmd_desc="close_list",
         )
+    _invalidate_list_index(robot)
     return _ok()
 
-def create_list(xml_file: Path | str) -> Tuple[bool, str, Exception | None]:
+# config の status が closed かどうか
+def is_list_closed(listname: str, *, robot: str | None = None) -> Tuple[bool, bool, Exception | None]:
+    config = listdata_dir(robot) / listname / "config"
+    if not config.exists():
+        return _ok(False)
+    try:
+        text = config.read_text(encoding="utf-8", errors="ignore")
+    except OSError as e:
+        return _ng(f"config が読み取れません: {config}: {e}", cmd_desc="is_list_closed")
+    closed = any(line.split() == ["status", "closed"] for line in text.splitlines())
+    return _ok(closed)
+
+def create_list(xml_file: Path | str, *, robot: str | None = None) -> Tuple[bool, str, Exception | None]:
     xml_file = str(xml_file)
-    rc, out, err = run_sympa(["--create_list", "--robot", DOMAIN, "--input_file", xml_file])
+    rc, out, err = run_sympa(["--create_list", "--robot", _robot(robot), "--input_file", xml_file])
+    _invalidate_list_index(robot)
     if rc != 0:
         return _ng(
             f"create_list 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
@@ -109,13 +231,12 @@ def create_list(xml_file: Path | str) -> Tuple[bool, str, Exception | None]:
         )
     return _ok(out)
 
-def _add_role_from_file(listname: str, role: Role, file_path: Path | str) -> Tuple[bool, None, Exception | None]:
-    p = Path(file_path)
-    if not p.exists():
-        return _ng(f"ファイルが存在しません: {p}")
-    input_text = p.read_text(encoding="utf-8")
+def add_emails(listname: str, role: Role, emails: List[str], *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    if not emails:
+        return _ok()
+    input_text = "\n".join(emails) + "\n"
     rc, out, err = run_sympa(
-        ["add", "--quiet", f"--role={role.value}", f"{listname}@{DOMAIN}"],
+        ["add", "--quiet", f"--role={role.value}", f"{listname}@{_robot(robot)}"],
         input_text=input_text,
     )
     if rc != 0:
@@ -125,46 +246,66 @@ def _add_role_from_file(listname: str, role: Role, file_path: Path | str) -> Tup
         )
     return _ok()
 
-def add_members(listname: str, member_file: Path | str) -> Tuple[bool, None, Exception | None]:
-    return _add_role_from_file(listname, Role.MEMBER, member_file)
-
-def add_editor(listname: str, editor_file: Path | str) -> Tuple[bool, None, Exception | None]:
-    return _add_role_from_file(listname, Role.EDITOR, editor_file)
-
-def add_owners(listname: str, owner_file: Path | str) -> Tuple[bool, None, Exception | None]:
-    return _add_role_from_file(listname, Role.OWNER, owner_file)
-
-def _del_role(listname: str, role: Role) -> Tuple[bool, None, Exception | None]:
-    ok, emails, err = get_list_emails(listname, role.value)
-    if not ok:
-        return False, None, err
+def del_emails(listname: str, role: Role, emails: List[str], *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
     if not emails:
         return _ok()
     input_text = "\n".join(emails) + "\n"
-    rc, out, serr = run_sympa(
-        ["del", "--quiet", f"--role={role.value}", f"{listname}@{DOMAIN}"],
+    rc, out, err = run_sympa(
+        ["del", "--quiet", f"--role={role.value}", f"{listname}@{_robot(robot)}"],
         input_text=input_text,
     )
     if rc != 0:
         return _ng(
-            f"del 失敗 role={role.value} rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{serr}",
+            f"del 失敗 role={role.value} rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
             cmd_desc="del",
         )
     return _ok()
 
-def del_members(listname: str) -> Tuple[bool, None, Exception | None]:
-    return _del_role(listname, Role.MEMBER)
+def _add_role_from_file(listname: str, role: Role, file_path: Path | str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    p = Path(file_path)
+    if not p.exists():
+        return _ng(f"ファイルが存在しません: {p}")
+    emails = p.read_text(encoding="utf-8").splitlines()
+    return add_emails(listname, role, emails, robot=robot)
+
+def add_members(listname: str, member_file: Path | str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _add_role_from_file(listname, Role.MEMBER, member_file, robot=robot)
+
+def add_editor(listname: str, editor_file: Path | str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _add_role_from_file(listname, Role.EDITOR, editor_file, robot=robot)
 
-def del_editors(listname: str) -> Tuple[bool, None, Exception | None]:
-    return _del_role(listname, Role.EDITOR)
+def add_owners(listname: str, owner_file: Path | str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _add_role_from_file(listname, Role.OWNER, owner_file, robot=robot)
 
-def del_owners(listname: str) -> Tuple[bool, None, Exception | None]:
-    return _del_role(listname, Role.OWNER)
+def _del_role(listname: str, role: Role, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    ok, emails, err = get_list_emails(listname, role.value, robot=robot)
+    if not ok:
+        return False, None, err
+    return del_emails(listname, role, emails, robot=robot)
+
+def del_members(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _del_role(listname, Role.MEMBER, robot=robot)
+
+def del_editors(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _del_role(listname, Role.EDITOR, robot=robot)
+
+def del_owners(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    return _del_role(listname, Role.OWNER, robot=robot)
+
+
+# description は list_data 配下の info ファイルに保持される
+def set_list_description(listname: str, description: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    info = listdata_dir(robot) / listname / "info"
+    try:
+        info.write_text(description + "\n" if description else "", encoding="utf-8")
+    except OSError as e:
+        return _ng(f"info の書き込みに失敗しました: {info}: {e}", cmd_desc="set_list_description")
+    return _ok()
 
 
 # === dump/抽出 ===
-def dump_list_roles(listname: str) -> Tuple[bool, None, Exception | None]:
-    rc, out, err = run_sympa(["dump", "--roles=member,owner,editor", f"{listname}@{DOMAIN}"])
+def dump_list_roles(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    rc, out, err = run_sympa(["dump", "--roles=member,owner,editor", f"{listname}@{_robot(robot)}"])
     if rc != 0:
         return _ng(
             f"dump 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}",
@@ -172,38 +313,111 @@ def dump_list_roles(listname: str) -> Tuple[bool, None, Exception | None]:
         )
     return _ok()
 
-def extract_emails_from_dump(file: Path | str) -> Tuple[bool, List[str], Exception | None]:
+def extract_email_ids_from_dump(file: Path | str) -> Tuple[bool, array, Exception | None]:
     p = Path(file)
+    ids = array("I")
     if not p.exists():
-        return _ok([])
-    emails: List[str] = []
+        return _ok(ids)
     with p.open("r", encoding="utf-8", errors="ignore") as f:
         for line in f:
             if line.startswith("email "):
                 parts = line.strip().split()
                 if len(parts) >= 2:
-                    emails.append(parts[1])
-    return _ok(emails)
+                    ids.append(ADDRESSES.intern(parts[1]))
+    return _ok(ids)
+
+def extract_emails_from_dump(file: Path | str) -> Tuple[bool, List[str], Exception | None]:
+    ok, ids, err = extract_email_ids_from_dump(file)
+    if not ok:
+        return False, None, err  # type: ignore[return-value]
+    return _ok(ADDRESSES.to_addresses(ids))
 
-def get_list_emails(listname: str, role: str) -> Tuple[bool, List[str], Exception | None]:
-    ok, _, err = dump_list_roles(listname)
+def get_list_emails(listname: str, role: str, *, robot: str | None = None) -> Tuple[bool, List[str], Exception | None]:
+    ok, _, err = dump_list_roles(listname, robot=robot)
     if not ok:
         return False, None, err  # type: ignore[return-value]
-    file = LISTDATA_DIR / listname / f"{role}.dump"
+    file = listdata_dir(robot) / listname / f"{role}.dump"
     return extract_emails_from_dump(file)
 
-def parse_list_roles(listname: str) -> Tuple[bool, Dict[str, List[str]], Exception | None]:
-    ok, _, err = dump_list_roles(listname)
+def get_list_role_ids(listname: str, *, robot: str | None = None) -> Tuple[bool, Dict[str, array], Exception | None]:
+    ok, _, err = dump_list_roles(listname, robot=robot)
     if not ok:
         return False, None, err  # type: ignore[return-value]
-    listdir = LISTDATA_DIR / listname
-    result: Dict[str, List[str]] = {"owner": [], "editor": [], "member": []}
+    listdir = listdata_dir(robot) / listname
+    result: Dict[str, array] = {}
     for role in ("owner", "editor", "member"):
         f = listdir / f"{role}.dump"
-        ok2, emails, err2 = extract_emails_from_dump(f)
+        ok2, ids, err2 = extract_email_ids_from_dump(f)
         if not ok2:
             return False, None, err2  # type: ignore[return-value]
-        result[role] = emails
+        result[role] = ids
+    return _ok(result)
+
+def parse_list_roles(listname: str, *, robot: str | None = None) -> Tuple[bool, Dict[str, List[str]], Exception | None]:
+    ok, ids, err = get_list_role_ids(listname, robot=robot)
+    if not ok:
+        return False, None, err  # type: ignore[return-value]
+    return _ok({role: ADDRESSES.to_addresses(role_ids) for role, role_ids in ids.items()})
+
+
+# === purge 待ちキュー ===
+# 1行1ML: robot<TAB>listname<TAB>閉鎖時刻(epoch秒)
+# 複数プロセス/スレッドから更新されるため、ファイルロックを取って読み書きする
+_PURGE_QUEUE_LOCK = threading.Lock()
+
+def _parse_purge_queue(text: str) -> List[Tuple[str, str, int]]:
+    entries: List[Tuple[str, str, int]] = []
+    for line in text.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 3 and parts[2].isdigit():
+            entries.append((parts[0], parts[1], int(parts[2])))
+    return entries
+
+@contextmanager
+def _locked_purge_queue() -> Iterator[List[Tuple[str, str, int]]]:
+    PURGE_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with _PURGE_QUEUE_LOCK, PURGE_QUEUE_FILE.open("a+", encoding="utf-8") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        entries = _parse_purge_queue(f.read())
+        yield entries
+        f.seek(0)
+        f.truncate()
+        f.write("".join(f"{r}\t{n}\t{t}\n" for r, n, t in entries))
+
+def enqueue_purge(listname: str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
+    try:
+        with _locked_purge_queue() as entries:
+            # 登録済みなら閉鎖時刻は元のまま（猶予期間を延ばさない）
+            if not any((e[0], e[1]) == (_robot(robot), listname) for e in entries):
+                entries.append((_robot(robot), listname, int(time.time())))
+    except OSError as e:
+        return _ng(f"purge キューの更新に失敗しました: {PURGE_QUEUE_FILE}: {e}", cmd_desc="enqueue_purge")
+    return _ok()
+
+def dequeue_purge(listname: str, *, robot: str | None = None) -> Tuple[bool, bool, Exception | None]:
+    """キューから取り除く。結果はキューに存在したかどうか"""
+    try:
+        with _locked_purge_queue() as entries:
+            n = len(entries)
+            entries[:] = [e for e in entries if (e[0], e[1]) != (_robot(robot), listname)]
+            found = len(entries) != n
+    except OSError as e:
+        return _ng(f"purge キューの更新に失敗しました: {PURGE_QUEUE_FILE}: {e}", cmd_desc="dequeue_purge")
+    return _ok(found)
+
+def get_purge_queue() -> Tuple[bool, List[Tuple[str, str, int]], Exception | None]:
+    if not PURGE_QUEUE_FILE.exists():
+        return _ok([])
+    # 読み取りのみのため共有ロックで読み、書き戻さない
+    try:
+        with PURGE_QUEUE_FILE.open("r", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            result = _parse_purge_queue(f.read())
+    except FileNotFoundError:
+        return _ok([])
+    except OSError as e:
+        return _ng(f"purge キューの読み込みに失敗しました: {PURGE_QUEUE_FILE}: {e}", cmd_desc="get_purge_queue")
     return _ok(result)
 
 
@@ -223,11 +437,11 @@ def mktemp_dir(prefix: str = "tmp_sympa_") -> Path:
     return path
 
 
-def backup_ml(listname: str) -> Tuple[bool, Path, Exception | None]:
-    ok, _, err = dump_list_roles(listname)
+def backup_ml(listname: str, *, robot: str | None = None) -> Tuple[bool, Path, Exception | None]:
+    ok, _, err = dump_list_roles(listname, robot=robot)
     if not ok:
         return False, None, err  # type: ignore[return-value]
-    src_dir = LISTDATA_DIR / listname
+    src_dir = listdata_dir(robot) / listname
     backup_dir = mktemp_dir(prefix=f"sympa_ml_backup_{listname}_")
     if src_dir.is_dir():
         for pat in ("*.dump", "config*"):
@@ -235,25 +449,25 @@ def backup_ml(listname: str) -> Tuple[bool, Path, Exception | None]:
                 (backup_dir / src.name).write_bytes(src.read_bytes())
     return _ok(backup_dir)
 
-def restore_ml(listname: str, backup_dir: Path | str) -> Tuple[bool, None, Exception | None]:
+def restore_ml(listname: str, backup_dir: Path | str, *, robot: str | None = None) -> Tuple[bool, None, Exception | None]:
     bdir = Path(backup_dir)
     if not bdir.is_dir():
         return _ng(f"Backup directory does not exist: {bdir}")
-    ok, _, err = del_members(listname)
+    ok, _, err = del_members(listname, robot=robot)
     if not ok:
         return False, None, err
-    ok, _, err = del_editors(listname)
+    ok, _, err = del_editors(listname, robot=robot)
     if not ok:
         return False, None, err
-    ok, _, err = del_owners(listname)
+    ok, _, err = del_owners(listname, robot=robot)
     if not ok:
         return False, None, err
-    dst_dir = LISTDATA_DIR / listname
+    dst_dir = listdata_dir(robot) / listname
     dst_dir.mkdir(parents=True, exist_ok=True)
     for item in bdir.iterdir():
         if item.is_file():
             (dst_dir / item.name).write_bytes(item.read_bytes())
-    rc, out, serr = run_sympa(["restore", "--roles=member,owner,editor", f"{listname}@{DOMAIN}"])
+    rc, out, serr = run_sympa(["restore", "--roles=member,owner,editor", f"{listname}@{_robot(robot)}"])
     if rc != 0:
         return _ng(
             f"restore 失敗 rc={rc}\nSTDOUT:\n{out}\nSTDERR:\n{serr}",
@@ -263,11 +477,26 @@ def restore_ml(listname: str, backup_dir: Path | str) -> Tuple[bool, None, Excep
 
 
 # === .list ファイルパーサ ===
+# アドレスは ADDRESSES のIDで保持する（owners/editors/members は文字列のリストを返す）
+# originals には正規化で表記が変わった行だけ、(ロール, ロール内の位置) → 書かれたままの表記 を持つ
 @dataclass
 class MLFile:
-    owners: List[str]
-    editors: List[str]
-    members: List[str]
+    owner_ids: array
+    editor_ids: array
+    member_ids: array
+    originals: Dict[Tuple[str, int], str] = field(default_factory=dict)
+
+    @property
+    def owners(self) -> List[str]:
+        return ADDRESSES.to_addresses(self.owner_ids)
+
+    @property
+    def editors(self) -> List[str]:
+        return ADDRESSES.to_addresses(self.editor_ids)
+
+    @property
+    def members(self) -> List[str]:
+        return ADDRESSES.to_addresses(self.member_ids)
 
 _SECTION_RE = re.compile(r"^\[(owner|editor|member)\]\s*$")
 
@@ -278,9 +507,11 @@ def load_ml_file(path: Path | str) -> Tuple[bool, MLFile, Exception | None]:
     if not p.exists() or not p.is_file():
         return _ng(f"ファイルが読み取れません: {p}")
 
-    owners: List[str] = []
-    editors: List[str] = []
-    members: List[str] = []
+    owners = array("I")
+    editors = array("I")
+    members = array("I")
+    roles = {"owner": owners, "editor": editors, "member": members}
+    originals: Dict[Tuple[str, int], str] = {}
 
     section: str | None = None
     with p.open("r", encoding="utf-8", errors="ignore") as f:
@@ -296,14 +527,57 @@ def load_ml_file(path: Path | str) -> Tuple[bool, MLFile, Exception | None]:
                 return _ng(f"不明なセクション: {line}")
             if not section:
                 return _ng(f"セクション定義前に値があります: {line}")
-            if section == "owner":
-                owners.append(line)
-            elif section == "editor":
-                editors.append(line)
-            elif section == "member":
-                members.append(line)
-
-    return _ok(MLFile(owners=owners, editors=editors, members=members))
+            aid = ADDRESSES.intern(line)
+            ids = roles[section]
+            if ADDRESSES.address(aid) != line:
+                originals[(section, len(ids))] = line
+            ids.append(aid)
+
+    return _ok(MLFile(owner_ids=owners, editor_ids=editors, member_ids=members, originals=originals))
+
+def validate_ml_file(ml: MLFile) -> Tuple[MLFile, List[Tuple[str, str, str]]]:
+    """
+    書式不正・ロール内重複を取り除いた MLFile と、検出した (role, address, reason) のリストを返す。
+    address は .list に書かれたままの表記。
+    アドレスは canonical_address で小文字化済みのため、ID の一致で重複を判定する。
+    複数ロールに現れるアドレスは Sympa 上問題ないため残し、reason に記録するのみ。
+    """
+    issues: List[Tuple[str, str, str]] = []
+    first_role: Dict[int, str] = {}
+    cleaned: Dict[str, array] = {}
+    for role, ids in (("owner", ml.owner_ids), ("editor", ml.editor_ids), ("member", ml.member_ids)):
+        seen = set()
+        out = array("I")
+        for i, aid in enumerate(ids):
+            text = ml.originals.get((role, i)) or ADDRESSES.address(aid)
+            if not ADDRESSES.is_valid(aid):
+                issues.append((role, text, "invalid"))
+                continue
+            if aid in seen:
+                issues.append((role, text, "duplicate"))
+                continue
+            seen.add(aid)
+            out.append(aid)
+            other = first_role.setdefault(aid, role)
+            if other != role:
+                issues.append((role, text, f"also {other} (kept)"))
+        cleaned[role] = out
+    return (
+        MLFile(owner_ids=cleaned["owner"], editor_ids=cleaned["editor"], member_ids=cleaned["member"]),
+        issues,
+    )
+
+def emptied_roles(ml: MLFile, validated: MLFile) -> List[str]:
+    """.list では空でなかったのに、検証で全アドレスが除外されたロール"""
+    return [
+        role
+        for role, before, after in (
+            ("owner", ml.owner_ids, validated.owner_ids),
+            ("editor", ml.editor_ids, validated.editor_ids),
+            ("member", ml.member_ids, validated.member_ids),
+        )
+        if before and not after
+    ]
 
 def escape_xml(s: str) -> str:
     s = s.replace("&", "&amp;")